@@ -22,12 +22,16 @@ Default:
 Only uses Slurm CLI and standard Unix tools; degrades gracefully if some are missing.
 """
 import argparse
+import atexit
+import getpass
+import json
 import os
 import re
 import subprocess
 import sys
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from shutil import which
 import select
 try:
@@ -36,57 +40,59 @@ try:
 except Exception:
     _HAS_TERMIOS = False
 
+# Cursor-home + erase-display: clears the screen without forking
+# /bin/sh -c clear on every watch refresh (and without the flicker).
+_CLEAR = "\x1b[H\x1b[2J"
+
 # ---------- ANSI helpers ----------
 ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
 
 def visible_len(s):
-    return len(ANSI_RE.sub("", s))
+    # Plain cells (the common case) never reach the regex engine.
+    return len(s) if "\x1b" not in s else len(ANSI_RE.sub("", s))
 
 def colorize(enabled, code, s):
+    # Called hundreds of times per frame: plain cells exit first, and the
+    # f-string builds the colored cell in one allocation instead of four
+    # intermediate concats.
     if not enabled or not code:
         return s
-    return "\033[" + code + "m" + s + "\033[0m"
+    return f"\x1b[{code}m{s}\x1b[0m"
+
+# Hoisted to module scope: color_state runs once per cell per refresh, so the
+# normalization table and color map shouldn't be rebuilt on every call.
+# Prefix order mirrors the old if/elif chain (normalizes variants like CANCELLED+).
+_STATE_PREFIXES = (
+    "CANCELLED", "RUNNING", "PENDING", "COMPLETED",
+    "FAILED", "SUSPENDED", "COMPLETING", "CONFIGURING",
+)
+_STATE_COLORS = {
+    "RUNNING": "32",       # green
+    "COMPLETED": "36",     # cyan
+    "PENDING": "33",       # yellow
+    "COMPLETING": "36",    # cyan
+    "CONFIGURING": "33",   # yellow
+    "FAILED": "31",        # red
+    "CANCELLED": "35",     # magenta
+    "TIMEOUT": "31",       # red
+    "OUT_OF_MEMORY": "31", # red
+    "SUSPENDED": "35",     # magenta
+}
 
 def color_state(use_color, state):
     raw = (state or "")
     s = raw.upper()
-    # normalize variants like CANCELLED+
-    if s.startswith("CANCELLED"):
-        key = "CANCELLED"
-    elif s.startswith("RUNNING"):
-        key = "RUNNING"
-    elif s.startswith("PENDING"):
-        key = "PENDING"
-    elif s.startswith("COMPLETED"):
-        key = "COMPLETED"
-    elif "TIMEOUT" in s:
-        key = "TIMEOUT"
-    elif "OUT_OF_MEMORY" in s or "OOM" in s:
-        key = "OUT_OF_MEMORY"
-    elif s.startswith("FAILED"):
-        key = "FAILED"
-    elif s.startswith("SUSPENDED"):
-        key = "SUSPENDED"
-    elif s.startswith("COMPLETING"):
-        key = "COMPLETING"
-    elif s.startswith("CONFIGURING"):
-        key = "CONFIGURING"
-    else:
-        key = s
-
-    colors = {
-        "RUNNING": "32",       # green
-        "COMPLETED": "36",     # cyan
-        "PENDING": "33",       # yellow
-        "COMPLETING": "36",    # cyan
-        "CONFIGURING": "33",   # yellow
-        "FAILED": "31",        # red
-        "CANCELLED": "35",     # magenta
-        "TIMEOUT": "31",       # red
-        "OUT_OF_MEMORY": "31", # red
-        "SUSPENDED": "35",     # magenta
-    }
-    code = colors.get(key)
+    code = _STATE_COLORS.get(s)
+    if code is None:
+        for pfx in _STATE_PREFIXES:
+            if s.startswith(pfx):
+                code = _STATE_COLORS[pfx]
+                break
+        else:
+            if "TIMEOUT" in s:
+                code = _STATE_COLORS["TIMEOUT"]
+            elif "OUT_OF_MEMORY" in s or "OOM" in s:
+                code = _STATE_COLORS["OUT_OF_MEMORY"]
     return colorize(use_color, code, raw) if code else raw
 
 # ---------- subprocess helpers ----------
@@ -99,10 +105,24 @@ def run(cmd, text=True):
     except Exception:
         return ""
 
+@lru_cache(maxsize=None)
 def have(cmd):
+    # which() walks every $PATH entry with a stat; under --watch these
+    # lookups repeat each tick, and NFS-mounted PATH dirs make them slow.
     return which(cmd) is not None
 
+# One username lookup at import (env, then pwd db) instead of forking whoami
+# on every squeue/sacct/ssh call site.
+try:
+    _ME = getpass.getuser()
+except Exception:
+    _ME = run(["whoami"]).strip()
+
 # ---------- Slurm helpers ----------
+# Prefix up to the first '[' or ',', then the first index digits if any.
+_NL_RE = re.compile(r"^([^\[,]+)(?:\[(\d+))?")
+
+@lru_cache(maxsize=1024)
 def first_node(nodelist):
     """
     Convert Slurm NodeList strings into a single concrete hostname.
@@ -110,96 +130,263 @@ def first_node(nodelist):
       'c1028' -> 'c1028'
       'c[1028-1030,1040]' -> 'c1028'
       '(null)' or 'None assigned' -> ''
+
+    One compiled match replaces the old split cascade, and results are
+    memoized since the same nodelists recur on every refresh.
     """
     if not nodelist:
         return ""
     val = nodelist.strip()
     if val in {"(null)", "None", "None assigned"}:
         return ""
-    if "[" not in val or "]" not in val:
-        return val.split(",")[0].strip()
-    prefix = val.split("[", 1)[0]
-    inside = val.split("[", 1)[1].rsplit("]", 1)[0]
-    first = inside.split(",")[0]
-    if "-" in first:
-        start = first.split("-", 1)[0]
-        return prefix + start
-    return prefix + first
+    m = _NL_RE.match(val)
+    if not m:
+        return ""
+    prefix, idx = m.group(1), m.group(2)
+    return prefix + idx if idx else prefix.strip()
+
+# TTL caches: rapid --watch refreshes (or a color toggle redraw) shouldn't
+# each cost a slurmctld/slurmdbd RPC — uncapped CLI polling loops are a
+# well-known way students accidentally DOS the controller.
+_MIN_POLL = 5.0  # seconds; overridable via --min-poll
+_SQUEUE_CACHE = {}  # user -> (timestamp, rows)
+_SACCT_CACHE = {}   # (user, hours) -> (timestamp, rows)
+
+# --json support: squeue and sacct both grew it in 21.08. Structured output
+# means no fragile '|' splitting; older Slurm falls back to the -o path.
+_SLURM_VER = None
+
+def _slurm_version():
+    global _SLURM_VER
+    if _SLURM_VER is None:
+        m = re.search(r"(\d+)\.(\d+)", run(["squeue", "--version"]))
+        _SLURM_VER = (int(m.group(1)), int(m.group(2))) if m else (0, 0)
+    return _SLURM_VER
+
+def _jnum(v):
+    """Unwrap the {set, infinite, number} wrappers newer --json emits."""
+    if isinstance(v, dict):
+        return v.get("number", 0) if v.get("set") else 0
+    return v or 0
+
+def _jstate(v):
+    """Job state: plain string in older dumps, list of flags in newer ones."""
+    if isinstance(v, (list, tuple)):
+        return v[0] if v else ""
+    return v or ""
+
+def _fmt_dur(secs):
+    """Format seconds the way squeue's %M does (M:SS, H:MM:SS, D-HH:MM:SS)."""
+    m, s = divmod(max(0, int(secs)), 60)
+    h, m = divmod(m, 60)
+    d, h = divmod(h, 24)
+    if d:
+        return "{}-{:02d}:{:02d}:{:02d}".format(d, h, m, s)
+    if h:
+        return "{}:{:02d}:{:02d}".format(h, m, s)
+    return "{}:{:02d}".format(m, s)
+
+def _fmt_mem(mb):
+    mb = int(mb)
+    if mb and mb % 1024 == 0:
+        return "{}G".format(mb // 1024)
+    return "{}M".format(mb)
+
+def _parse_squeue_json(user):
+    """Rows from `squeue --json`, same shape as the -o path; None on failure."""
+    out = run(["squeue", "-u", user, "--json"])
+    if not out:
+        return None
+    try:
+        jobs = json.loads(out)["jobs"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    now = time.time()
+    rows = []
+    for j in jobs:
+        # Early --json builds ignored filter options and dumped the whole
+        # cluster queue; re-filter client-side so the cancel menu can never
+        # list someone else's jobs.
+        if j.get("user_name", user) != user:
+            continue
+        state = _jstate(j.get("job_state"))
+        start = _jnum(j.get("start_time"))
+        elapsed = _fmt_dur(now - start) if start and state == "RUNNING" else "0:00"
+        mem = _jnum(j.get("memory_per_node")) or _jnum(j.get("memory_per_cpu"))
+        nodes = j.get("nodes") or ""
+        if not nodes or nodes in ("(null)", "None assigned"):
+            reason = j.get("state_reason") or ""
+            nodes = "({})".format(reason) if reason and reason != "None" else ""
+        rows.append([
+            str(j.get("job_id", "")),
+            j.get("name", ""),
+            state,
+            elapsed,
+            str(_jnum(j.get("cpus")) or ""),
+            _fmt_mem(mem) if mem else "",
+            j.get("partition", ""),
+            nodes,
+        ])
+    return rows
+
+def _parse_sacct_json(user, since):
+    """Rows from `sacct --json` in include_history's shape; None on failure."""
+    out = run(["sacct", "-u", user, "-S", since, "--json"])
+    if not out:
+        return None
+    try:
+        jobs = json.loads(out)["jobs"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    rows = []
+    for j in jobs:
+        # Same defensive user filter as the squeue path.
+        if j.get("user", user) != user:
+            continue
+        state = _jstate((j.get("state") or {}).get("current"))
+        elapsed = _fmt_dur(_jnum((j.get("time") or {}).get("elapsed")))
+        req = j.get("required") or {}
+        mem = _jnum(req.get("memory_per_node")) or _jnum(req.get("memory"))
+        rows.append([
+            str(j.get("job_id", "")),
+            j.get("name", ""),
+            state,
+            elapsed,
+            str(_jnum(req.get("CPUs")) or ""),
+            _fmt_mem(mem) if mem else "",
+            "-", "-",
+        ])
+    return rows
 
 def parse_squeue(user_override=None):
     # Custom format: JobID,Name,State,Elapsed,CPUS,Mem,Partition,NodeList/Reason
     fmt = "%i|%j|%T|%M|%C|%m|%P|%R"
-    user = (user_override or os.getenv("USER", "").strip() or run(["whoami"]).strip())
-    out = run(["squeue", "-h", "-u", user, "-o", fmt])
-    rows = []
-    if not out:
-        return rows
-    for line in out.strip().splitlines():
-        parts = line.split("|")
-        if len(parts) < 8:
-            continue
-        rows.append(parts)
+    user = user_override or _ME
+    cached = _SQUEUE_CACHE.get(user)
+    now = time.time()
+    if cached and now - cached[0] < _MIN_POLL:
+        return cached[1]
+    rows = _parse_squeue_json(user) if _slurm_version() >= (21, 8) else None
+    if rows is None:
+        out = run(["squeue", "-h", "-u", user, "-o", fmt])
+        # Bounded split: stop at 8 fields so the list never over-allocates and
+        # a stray '|' in the reason column can't break the 8-way row unpacks.
+        rows = [p for p in (line.split("|", 7) for line in out.splitlines())
+                if len(p) == 8] if out else []
+    _SQUEUE_CACHE[user] = (now, rows)
     return rows
 
-def print_table(rows, use_color=False):
-    headers = ["JOBID","NAME","STATE","ELAPSED","CPUS","MEM","PARTITION","NODE"]
-    colw = []
-    for i, h in enumerate(headers):
-        max_cell = 0
-        for r in rows:
-            if i < len(r):
-                max_cell = max(max_cell, visible_len(r[i]))
-        colw.append(max(visible_len(h), max_cell))
-
-    head_cells = [colorize(use_color, "1;36", h) for h in headers]
-    out = []
-    for i, cell in enumerate(head_cells):
-        pad = colw[i] - visible_len(cell)
-        out.append(cell + (" " * pad if pad > 0 else ""))
-    print("  ".join(out))
+_HEADERS = ("JOBID","NAME","STATE","ELAPSED","CPUS","MEM","PARTITION","NODE")
+_HEADER_CELLS = {}  # use_color -> pre-colorized header cells (they never change)
+_SPACES = " " * 128  # shared pad source; slicing it beats building fresh pads
 
+def print_table(rows, use_color=False):
+    headers = _HEADERS
+    ncols = len(headers)
+    # Materialize (colored cell, visible width) in one pass. Widths come from
+    # the plain text, so the print loop never touches the ANSI regex at all.
+    table = []
     for r in rows:
-        cells = list(r)
-        if len(cells) >= 3:
-            cells[2] = color_state(use_color, cells[2])
-        if len(cells) >= 8 and cells[7] and cells[7] not in ("-", ""):
-            cells[7] = colorize(use_color, "36", cells[7])  # cyan node
+        cells = []
+        for i, cell in enumerate(r[:ncols]):
+            w = visible_len(cell)
+            if i == 2:
+                cell = color_state(use_color, cell)
+            elif i == 7 and cell and cell not in ("-", ""):
+                cell = colorize(use_color, "36", cell)  # cyan node
+            cells.append((cell, w))
+        table.append(cells)
+
+    colw = [len(h) for h in headers]
+    for cells in table:
+        for i, (_, w) in enumerate(cells):
+            if w > colw[i]:
+                colw[i] = w
+
+    # Assemble the frame and emit it in one write: stdout is line-buffered on
+    # a TTY, so per-line print() costs a syscall each — noticeable for a wide
+    # watch table over ssh.
+    head = _HEADER_CELLS.get(use_color)
+    if head is None:
+        head = _HEADER_CELLS[use_color] = [colorize(use_color, "1;36", h) for h in headers]
+    out = []
+    for i, cell in enumerate(head):
+        pad = colw[i] - len(headers[i])
+        if pad > 0:
+            out.append(cell + (_SPACES[:pad] if pad <= 128 else " " * pad))
+        else:
+            out.append(cell)
+    buf = ["  ".join(out)]
 
+    for cells in table:
         out = []
-        for i, cell in enumerate(cells[:len(headers)]):
-            pad = colw[i] - visible_len(cell)
-            out.append(cell + (" " * pad if pad > 0 else ""))
-        print("  ".join(out))
+        for i, (cell, w) in enumerate(cells):
+            pad = colw[i] - w
+            if pad <= 0:
+                out.append(cell)
+            elif w == len(cell):
+                # Plain cell: one C-level ljust, no separate pad string.
+                out.append(cell.ljust(colw[i]))
+            else:
+                # ANSI cell: pad by visible width from the shared pool.
+                out.append(cell + (_SPACES[:pad] if pad <= 128 else " " * pad))
+        buf.append("  ".join(out))
+    sys.stdout.write("\n".join(buf) + "\n")
 
 def details_job(jobid):
     print("== Job {} ==".format(jobid))
+    # Each query round-trips to slurmctld/slurmdbd independently, so launch
+    # them all at once and collect in order: wallclock becomes the slowest
+    # call instead of the sum of the three.
+    queries = []
     if have("scontrol"):
-        print("-- scontrol show job --")
-        print(run(["scontrol", "show", "job", str(jobid)]).strip())
+        queries.append(("-- scontrol show job --",
+                        ["scontrol", "show", "job", str(jobid)]))
     if have("sstat"):
-        print("-- sstat (live averages) --")
-        print(run(["sstat", "-j", "{}.batch".format(jobid), "--format=AveCPU,AveRSS,MaxRSS,MaxVMSize,AllocCPUS"]).strip())
+        queries.append(("-- sstat (live averages) --",
+                        ["sstat", "-j", "{}.batch".format(jobid), "--format=AveCPU,AveRSS,MaxRSS,MaxVMSize,AllocCPUS"]))
     if have("sacct"):
-        print("-- sacct (accounting) --")
-        print(run(["sacct", "-j", str(jobid), "--format=JobID,State,Elapsed,MaxRSS,MaxVMSize,AveRSS,CPUTimeRAW"]).strip())
+        queries.append(("-- sacct (accounting) --",
+                        ["sacct", "-j", str(jobid), "--format=JobID,State,Elapsed,MaxRSS,MaxVMSize,AveRSS,CPUTimeRAW"]))
+
+    procs = []
+    for label, argv in queries:
+        try:
+            p = subprocess.Popen(argv, stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL, universal_newlines=True)
+        except Exception:
+            p = None
+        procs.append((label, p))
+
+    for label, p in procs:
+        print(label)
+        print((p.communicate()[0] if p else "").strip())
 
 def include_history(hours, user_override=None):
     if not have("sacct"):
         return []
-    user = (user_override or os.getenv("USER", "").strip() or run(["whoami"]).strip())
+    user = user_override or _ME
+    cached = _SACCT_CACHE.get((user, hours))
+    now = time.time()
+    if cached and now - cached[0] < _MIN_POLL:
+        return cached[1]
     since = (datetime.now() - timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%S")
+    rows = _parse_sacct_json(user, since) if _slurm_version() >= (21, 8) else None
+    if rows is not None:
+        _SACCT_CACHE[(user, hours)] = (now, rows)
+        return rows
     out = run(["sacct", "-u", user, "-S", since, "--parsable2", "--noheader",
                "--format=JobID,JobName,State,Elapsed,ReqMem,AllocCPUS"])
     rows = []
-    if not out:
-        return rows
-    for line in out.strip().splitlines():
-        parts = line.split("|")
-        if len(parts) >= 6:
-            jobid, jobname, state, elapsed, reqmem, alloccpus = parts[:6]
-            if "." in jobid:
-                continue
-            rows.append([jobid, jobname, state, elapsed, alloccpus, reqmem, "-", "-"])
+    if out:
+        # History windows can span thousands of lines; bound the split at the
+        # six requested fields and skip step rows (12345.batch etc.) early.
+        for line in out.splitlines():
+            parts = line.split("|", 5)
+            if len(parts) == 6 and parts[0].find(".") == -1:
+                jobid, jobname, state, elapsed, reqmem, alloccpus = parts
+                rows.append([jobid, jobname, state, elapsed, alloccpus, reqmem, "-", "-"])
+    _SACCT_CACHE[(user, hours)] = (now, rows)
     return rows
 
 # ---------- helpers for jobid & dedup ----------
@@ -224,33 +411,94 @@ def merge_rows_live_and_history(live_rows, hist_rows):
     return merged
 
 # ---------- node info (local or remote) ----------
+_SSH_OPTS = [
+    "-o", "BatchMode=no",
+    "-o", "StrictHostKeyChecking=no",
+    "-o", "ConnectTimeout=5",
+    "-o", "LogLevel=ERROR",
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPersist=600",
+    "-o", "ControlPath=~/.ssh/cm-%r@%h:%p",
+    "-o", "NumberOfPasswordPrompts=1",
+    "-o", "PreferredAuthentications=publickey,password",
+    "-o", "KbdInteractiveAuthentication=no",
+]
+
+_ssh_masters = set()
+
+def _close_ssh_masters():
+    for host in _ssh_masters:
+        subprocess.call(["ssh", "-O", "exit",
+                         "-o", "ControlPath=~/.ssh/cm-%r@%h:%p", host],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+atexit.register(_close_ssh_masters)
+
+def _ensure_ssh_master(host):
+    """Pre-open a multiplexing master for `host` once per run.
+
+    Every later ssh for the same host then rides the warm socket as a
+    channel instead of renegotiating TCP+auth — for --watch with remote
+    node queries that's the difference between one handshake and one per
+    tick. Best-effort: if the master fails, the per-command ssh still
+    works via ControlMaster=auto.
+    """
+    if host in _ssh_masters:
+        return
+    _ssh_masters.add(host)
+    subprocess.call(["ssh", "-MNf"] + _SSH_OPTS + [host],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
 def _runcmd_local_or_remote(remote, c):
     """Single-attempt SSH to avoid multiple password prompts.
     If `remote` lacks a domain, append .oscer.ou.edu. If it lacks a user, prefix $USER@.
     """
     if not remote:
         return run(["bash", "-lc", c])
-    user = os.getenv("USER", "").strip() or run(["whoami"]).strip()
     host = remote
     if "." not in host:
         host = f"{host}.oscer.ou.edu"
     if "@" not in host:
-        host = f"{user}@{host}"
-    out = run(["ssh",
-               "-T",
-               "-o", "BatchMode=no",
-               "-o", "StrictHostKeyChecking=no",
-               "-o", "ConnectTimeout=5",
-               "-o", "LogLevel=ERROR",
-               "-o", "ControlMaster=auto",
-               "-o", "ControlPersist=60",
-               "-o", "ControlPath=~/.ssh/cm-%r@%h:%p",
-               "-o", "NumberOfPasswordPrompts=1",
-               "-o", "PreferredAuthentications=publickey,password",
-               "-o", "KbdInteractiveAuthentication=no",
-               host, c])
+        host = f"{_ME}@{host}"
+    _ensure_ssh_master(host)
+    out = run(["ssh", "-T"] + _SSH_OPTS + [host, c])
     return out or ""
 
+# lscpu fallback fields, matched in a single pass. Anchored at ^ so e.g.
+# "NUMA node0 CPU(s):" can't shadow the bare "CPU(s):" line.
+_LSCPU_KEYS = {
+    "Model name": "model",
+    "Socket(s)": "sockets",
+    "Core(s) per socket": "coresper",
+    "Thread(s) per core": "threadsper",
+    "CPU(s)": "cpus",
+    "CPU MHz": "mhz",
+    "CPU max MHz": "mhzmax",
+}
+_LSCPU_RE = re.compile(
+    r"^(Model name|Socket\(s\)|Core\(s\) per socket|Thread\(s\) per core"
+    r"|CPU\(s\)|CPU MHz|CPU max MHz):\s*(.+)$", re.M)
+
+# Fast node probe: one awk pass over /proc/cpuinfo plus O(1) proc/sysfs
+# reads, printing one field per line in a fixed order. lscpu walks sysfs
+# for every CPU — multi-millisecond on large-core nodes, and that many
+# more bytes over the wire for remote queries.
+_FAST_NODE_CMD = (
+    'LC_ALL=C awk -F": *" \''
+    "/^model name/ && !m {m=$2} "
+    "/^cpu MHz/ && !f {f=$2} "
+    "/^physical id/ {p[$2]=1} "
+    "/^cpu cores/ {c=$2} "
+    "/^siblings/ {s=$2} "
+    "END {n=0; for (i in p) n++; print m; print (n?n:1); print (c?c:1); print ((c&&s)?s/c:1); print f}"
+    "' /proc/cpuinfo; "
+    "nproc; "
+    "cat /sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq 2>/dev/null || echo; "
+    "awk '/^MemTotal/ {printf \"%.1fGi\\n\", $2/1048576}' /proc/meminfo; "
+    "cat /proc/loadavg; "
+    "uptime -p 2>/dev/null || true"
+)
+
 def fetch_node_info(remote):
     """Collect CPU/mem/load info locally or via ssh <remote> using a SINGLE command."""
     info = {
@@ -267,55 +515,49 @@ def fetch_node_info(remote):
         "uptime": ""
     }
 
+    out = _runcmd_local_or_remote(remote, _FAST_NODE_CMD)
+    lines = out.splitlines() if out else []
+    if len(lines) >= 9 and lines[0].strip():
+        # Fixed line order; no regex needed.
+        info["model"]      = lines[0].strip()
+        info["sockets"]    = lines[1].strip()
+        info["coresper"]   = lines[2].strip()
+        info["threadsper"] = lines[3].strip()
+        info["mhz"]        = lines[4].strip()
+        info["cpus"]       = lines[5].strip()
+        khz = lines[6].strip()
+        if khz.isdigit():
+            info["mhzmax"] = "{:.4f}".format(int(khz) / 1000)
+        info["mem_total"]  = lines[7].strip()
+        info["load"]       = lines[8].strip()
+        info["uptime"]     = "\n".join(lines[9:]).strip()
+        return info
+
+    # Fallback: classic lscpu one-shot (no awk, or /proc laid out unexpectedly).
     one_shot = (
         "LC_ALL=C lscpu; "
-        "echo __SEP1__; "
+        "printf '\\0__SEP__\\0'; "
         "LC_ALL=C free -h | awk '/^Mem:/ {print $2}'; "
-        "echo __SEP2__; "
+        "printf '\\0__SEP__\\0'; "
         "cat /proc/loadavg; "
-        "echo __SEP3__; "
+        "printf '\\0__SEP__\\0'; "
         "uptime -p || true"
     )
 
-    if remote:
-        out = _runcmd_local_or_remote(remote, one_shot)
-    else:
-        out = run([
-            "bash", "-lc",
-            "LC_ALL=C lscpu; echo __SEP1__; "
-            "LC_ALL=C free -h | awk '/^Mem:/ {print $2}'; echo __SEP2__; "
-            "cat /proc/loadavg; echo __SEP3__; uptime -p || true"
-        ])
+    out = _runcmd_local_or_remote(remote, one_shot)
 
     if not out:
         return info
 
-    lines = out.splitlines()
-    blocks = []
-    cur = []
-    for line in lines:
-        if line.strip() == "__SEP1__":
-            blocks.append("\n".join(cur)); cur = []
-        elif line.strip() == "__SEP2__":
-            blocks.append("\n".join(cur)); cur = []
-        elif line.strip() == "__SEP3__":
-            blocks.append("\n".join(cur)); cur = []
-        else:
-            cur.append(line)
-    blocks.append("\n".join(cur))
+    # NUL sentinels can't collide with tool output and split in one C-level
+    # pass instead of a Python loop comparing every line to three markers.
+    blocks = out.split("\x00__SEP__\x00", 3)
 
     if blocks:
-        lscpu = blocks[0]
-        def g(rx):
-            m = re.search(rx, lscpu, re.M)
-            return m.group(1).strip() if m else ""
-        info["model"]      = g(r"Model name:\s*(.+)")
-        info["sockets"]    = g(r"Socket\(s\):\s*(\d+)")
-        info["coresper"]   = g(r"Core\(s\) per socket:\s*(\d+)")
-        info["threadsper"] = g(r"Thread\(s\) per core:\s*(\d+)")
-        info["cpus"]       = g(r"^CPU\(s\):\s*(\d+)")
-        info["mhz"]        = g(r"CPU MHz:\s*([\d\.]+)")
-        info["mhzmax"]     = g(r"CPU max MHz:\s*([\d\.]+)")
+        # One anchored multi-group scan over the lscpu block instead of seven
+        # full-text searches (each of those re-walked the whole output).
+        for m in _LSCPU_RE.finditer(blocks[0]):
+            info[_LSCPU_KEYS[m.group(1)]] = m.group(2).strip()
 
     if len(blocks) > 1:
         mem_line = blocks[1].strip()
@@ -333,19 +575,48 @@ def print_node_info(remote, use_color):
     i = fetch_node_info(remote)
     host = i['host'] or (remote or 'unknown')
     title = "Node Info — {}".format(host)
-    print(colorize(use_color, "1;36", title))
-    print(colorize(use_color, "2", "─" * len(title)))
-    print("{}    {}".format(colorize(use_color, "1;33", "CPU Model:"), i['model'] or 'N/A'))
     topo = "Sockets={}  Cores/Socket={}  Threads/Core={}  Logical CPUs={}".format(
         i['sockets'] or '?', i['coresper'] or '?', i['threadsper'] or '?', i['cpus'] or '?'
     )
-    print("{}     {}".format(colorize(use_color, "1;33", "Topology:"), topo))
     freq = "Base(?) MHz={}  Max MHz={}".format(i['mhz'] or '?', i['mhzmax'] or '?')
-    print("{}    {}".format(colorize(use_color, "1;33", "Frequency:"), freq))
-    print("{}       Total={}".format(colorize(use_color, "1;33", "Memory:"), i['mem_total'] or 'N/A'))
-    print("{}     {}".format(colorize(use_color, "1;33", "CPU Load:"), i['load'] or 'N/A'))
+    buf = [
+        colorize(use_color, "1;36", title),
+        colorize(use_color, "2", "─" * len(title)),
+        "{}    {}".format(colorize(use_color, "1;33", "CPU Model:"), i['model'] or 'N/A'),
+        "{}     {}".format(colorize(use_color, "1;33", "Topology:"), topo),
+        "{}    {}".format(colorize(use_color, "1;33", "Frequency:"), freq),
+        "{}       Total={}".format(colorize(use_color, "1;33", "Memory:"), i['mem_total'] or 'N/A'),
+        "{}     {}".format(colorize(use_color, "1;33", "CPU Load:"), i['load'] or 'N/A'),
+    ]
     if i["uptime"]:
-        print("{}       {}".format(colorize(use_color, "1;33", "Uptime:"), i['uptime']))
+        buf.append("{}       {}".format(colorize(use_color, "1;33", "Uptime:"), i['uptime']))
+    # One write for the whole card (see print_table).
+    sys.stdout.write("\n".join(buf) + "\n")
+
+# ---------- interactive prompt ----------
+def prompt(msg, timeout=None):
+    """Line reader for the menus built on select instead of blocking input().
+
+    Waiting in select keeps Ctrl-C responsive and plays nicely with the
+    watch loop's key reader (same fd, no termios re-toggling). Returns the
+    entered line without its newline; "" on EOF or timeout.
+    """
+    sys.stdout.write(msg)
+    sys.stdout.flush()
+    if not sys.stdin.isatty():
+        return sys.stdin.readline().rstrip("\n")
+    fd = sys.stdin.fileno()
+    buf = ""
+    while True:
+        r, _, _ = select.select([fd], [], [], timeout)
+        if not r:
+            return buf.strip()
+        chunk = os.read(fd, 4096).decode(errors="ignore")
+        if not chunk:
+            return buf.strip()
+        buf += chunk
+        if "\n" in buf:
+            return buf.split("\n", 1)[0].rstrip("\n")
 
 # ---------- ssh menu ----------
 def ssh_menu(use_color):
@@ -370,7 +641,7 @@ def ssh_menu(use_color):
         print(colorize(use_color, "32", line))
 
     try:
-        choice = int(input(colorize(use_color, "1;35", "Enter number: ")).strip())
+        choice = int(prompt(colorize(use_color, "1;35", "Enter number: ")).strip())
     except Exception:
         print("[ERROR] Invalid input.")
         return 1
@@ -392,29 +663,23 @@ def ssh_menu(use_color):
     os.execvp("ssh", ["ssh", "-t", "-o", "StrictHostKeyChecking=no", node, remote_cmd])
 
 # ---------- cancel menu ----------
+_SEL_RE = re.compile(r"(\d+)(?:-(\d+))?")
+
 def _parse_selection(s, n):
     """Parse a selection string like '1,3-5,7' into sorted unique indices (1..n)."""
+    # fullmatch per comma token: malformed entries ('1.5', '1-', '1;3') are
+    # dropped whole rather than mined for digits — a typo in a cancel
+    # selection must not quietly turn into a different job set.
     sel = set()
     for tok in s.replace(" ", "").split(","):
-        if not tok:
+        m = _SEL_RE.fullmatch(tok)
+        if not m:
             continue
-        if "-" in tok:
-            a, b = tok.split("-", 1)
-            try:
-                a = int(a); b = int(b)
-            except Exception:
-                continue
-            lo, hi = (a, b) if a <= b else (b, a)
-            for i in range(lo, hi+1):
-                if 1 <= i <= n:
-                    sel.add(i)
-        else:
-            try:
-                i = int(tok)
-            except Exception:
-                continue
-            if 1 <= i <= n:
-                sel.add(i)
+        a, b = m.groups()
+        lo, hi = int(a), int(b or a)
+        if lo > hi:
+            lo, hi = hi, lo
+        sel.update(range(max(lo, 1), min(hi, n) + 1))
     return sorted(sel)
 
 def cancel_menu(use_color):
@@ -452,7 +717,7 @@ def cancel_menu(use_color):
         )
         print(colorize(use_color, "33", line))
 
-    sel_str = input(colorize(use_color, "1;35", "Enter selection: ")).strip()
+    sel_str = prompt(colorize(use_color, "1;35", "Enter selection: ")).strip()
     indices = _parse_selection(sel_str, len(cancellable))
     if not indices:
         print("[INFO] Nothing selected; aborting.")
@@ -465,25 +730,40 @@ def cancel_menu(use_color):
         jobid, name, state, elapsed, cpus, mem, part, nodelist = r
         print(colorize(use_color, "31", f"  - {jobid}  ({state})  {name}"))
 
-    sure = input(colorize(use_color, "1;31", "Type 'yes' to confirm cancellation: ")).strip().lower()
+    sure = prompt(colorize(use_color, "1;31", "Type 'yes' to confirm cancellation: ")).strip().lower()
     if sure != "yes":
         print("[INFO] Confirmation not given. No jobs were cancelled.")
         return 1
 
-    # Execute scancel; collect per-job status
+    # One scancel for the whole selection: one fork and one controller RPC
+    # instead of one per job. Failures are attributed per job from stderr
+    # ("scancel: error: Kill job error on job id N: ...").
+    ids = [str(r[0]) for r in chosen]
     errs = 0
-    for r in chosen:
-        jobid = r[0]
-        try:
-            rc = subprocess.call(["scancel", str(jobid)])
-            if rc == 0:
+    try:
+        p = subprocess.Popen(["scancel"] + ids, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+        _, err = p.communicate()
+        err_lines = [l for l in err.splitlines() if l.strip()]
+        fails = {}
+        for jobid in ids:
+            # \b-anchored so job 123 is not blamed for an error about 1234.
+            pat = re.compile(rf"\b{jobid}\b")
+            fails[jobid] = next((l for l in err_lines if pat.search(l)), None)
+        # An unmatched id only counts as success when scancel exited 0, or
+        # when the failure was attributable to some other id. A nonzero exit
+        # with no id on stderr (e.g. controller unreachable) failed them all.
+        attributed = any(f is not None for f in fails.values())
+        for jobid in ids:
+            fail = fails[jobid]
+            if fail is None and (p.returncode == 0 or attributed):
                 print(colorize(use_color, "32", f"[OK] scancel {jobid}"))
             else:
-                print(colorize(use_color, "31", f"[ERR] scancel {jobid} → exit {rc}"))
+                print(colorize(use_color, "31", f"[ERR] scancel {jobid} → {fail or f'exit {p.returncode}'}"))
                 errs += 1
-        except Exception as e:
-            print(colorize(use_color, "31", f"[EXC] scancel {jobid}: {e}"))
-            errs += 1
+    except Exception as e:
+        print(colorize(use_color, "31", f"[EXC] scancel: {e}"))
+        errs = len(ids)
 
     if errs == 0:
         print(colorize(use_color, "1;32", "All selected jobs were sent a cancel request."))
@@ -493,6 +773,7 @@ def cancel_menu(use_color):
 
 # ---------- main ----------
 def main():
+    global _MIN_POLL
     ap = argparse.ArgumentParser(description="Pretty Slurm job status for students (+ SSH + node info + CANCEL menu)")
     ap.add_argument("--watch", nargs="?", const=3, type=int,
                     help="Refresh every N seconds (default 3 if no value supplied)")
@@ -503,9 +784,13 @@ def main():
     ap.add_argument("--nodeinfo", nargs="?", const="", metavar="NODE", help="Show colorful CPU/mem/load for local host or for NODE via SSH")
     ap.add_argument("--no-color", action="store_true", help="Disable ANSI colors")
     ap.add_argument("--color", action="store_true", help="Force ANSI colors even if stdout is not a TTY")
+    ap.add_argument("--min-poll", type=float, default=_MIN_POLL, metavar="SEC",
+                    help="Minimum seconds between real squeue/sacct calls; faster refreshes reuse cached rows (default 5)")
     ap.add_argument("--user", type=str, help="Show jobs for this USER instead of the current user (not used by cancel/ssh menus)")
     args = ap.parse_args()
 
+    _MIN_POLL = max(0.0, args.min_poll)
+
     target_user = args.user
 
     use_color = (not args.no_color) and (
@@ -539,13 +824,19 @@ def main():
             hours = int(harg)
         hist_rows = include_history(hours, target_user)
 
-    def render_once():
-        live = parse_squeue(target_user)
-        rows = merge_rows_live_and_history(live, hist_rows)
+    last = {}  # rows of the last frame, reused for color-toggle redraws
+
+    def render_once(reuse=False):
+        if reuse and "rows" in last:
+            rows = last["rows"]
+        else:
+            live = parse_squeue(target_user)
+            rows = merge_rows_live_and_history(live, hist_rows)
+            last["rows"] = rows
         if rows:
             print_table(rows, use_color)
         else:
-            who = (target_user or (os.getenv("USER", "").strip() or run(["whoami"]).strip()))
+            who = target_user or _ME
             print(f"[INFO] No jobs found for user: {who}.")
         sys.stdout.flush()
 
@@ -553,33 +844,46 @@ def main():
         interactive = sys.stdin.isatty() and _HAS_TERMIOS
         fd = None
         old_term = None
+        poller = None
         try:
             if interactive:
                 fd = sys.stdin.fileno()
                 old_term = termios.tcgetattr(fd)
                 tty.setcbreak(fd)  # char-at-a-time, no Enter needed
+                # Register the fd once; poll() skips select()'s per-call
+                # fd_set build and copy, which adds up over a long session.
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
             hint = "[watch] press 'q' to quit, 'c' to toggle color"
+            reuse = False
             while True:
-                os.system("clear")
+                sys.stdout.write(_CLEAR)
                 ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 print(colorize(use_color, "1;36", ts), end="  ")
                 print(colorize(use_color, "2", hint))
-                render_once()
+                render_once(reuse)
+                reuse = False
 
+                # Redraw at the requested rate; refreshes inside the poll
+                # floor reuse cached rows, so only the timestamp line and
+                # the RPC-free bits move between real squeue/sacct calls.
                 end_by = time.time() + args.watch
                 while True:
                     remaining = end_by - time.time()
                     if remaining <= 0:
                         break
-                    if interactive and fd is not None:
-                        r, _, _ = select.select([fd], [], [], min(0.2, max(0, remaining)))
-                        if r:
+                    if poller is not None:
+                        evs = poller.poll(int(min(0.2, max(0, remaining)) * 1000))
+                        if evs:
                             ch = os.read(fd, 1).decode(errors="ignore")
                             if ch in ("q", "Q"):
                                 raise KeyboardInterrupt
                             if ch in ("c", "C"):
                                 use_color = not use_color
-                                break  # redraw immediately with new color mode
+                                # Redraw from the cached rows: a recolor
+                                # shouldn't cost an extra squeue RPC.
+                                reuse = True
+                                break
                     else:
                         time.sleep(min(0.2, max(0, remaining)))
         except KeyboardInterrupt:
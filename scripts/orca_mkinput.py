@@ -30,28 +30,15 @@ NEB:
     orca_mkinput.py --xyz reactant.xyz --job nebts --neb-product product.xyz --neb-ts guessTS.xyz --method "PBEh-3c" --extra FREQ --charge 0 --mult 1 --name neb_ts --overwrite
 """
 
-import argparse
-import glob
+import functools
 import os
 import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # ----------------------------- Utilities -------------------------------------
 
-def _parse_extras(extra_list):
-    if not extra_list:
-        return []
-    toks = []
-    for item in extra_list:
-        for t in item.replace(",", " ").split():
-            t = t.strip()
-            if t:
-                toks.append(t)
-    return toks
-
-def _join_bang_tokens(tokens):
-    return "! " + " ".join([t for t in tokens if t])
-
 JOB_MAP = {
     "sp": [],
     "opt": ["Opt"],
@@ -59,32 +46,64 @@ JOB_MAP = {
     "optfreq": ["Opt", "Freq"],
     "optts": ["OptTS"],
     "tddft": [],
-    "neb": ["NEB"],       
-    "nebci": ["NEB-CI"],  
-    "nebts": ["NEB-TS"],  
+    "neb": ["NEB"],
+    "nebci": ["NEB-CI"],
+    "nebts": ["NEB-TS"],
 }
 
+_SCF_MARKERS = ("tightscf", "loosescf")
+
+def _has_scf_marker(tokens):
+    """True if the user already picked an SCF convergence level in extras."""
+    for t in tokens:
+        if t.lower().startswith(_SCF_MARKERS):
+            return True
+    return False
 
-def _make_bang_line(method, basis, job, grid_token, cpcm, smd, extra_tokens, force_tokens=None):
-    toks = []
-    if method:
-        toks.append(method)
-    if basis and basis not in ("None", "-", "NA"):
-        toks.append(basis)
-    if grid_token:
-        toks.append(grid_token)
-    # Default-tightSCF only if user didn’t explicitly add tightSCF/LooseSCF in extras
-    if not any(t.lower().startswith(("tightscf", "loosescf")) for t in extra_tokens):
-        toks.append("TightSCF")
-    toks += JOB_MAP.get(job, [])
-    if cpcm:
-        toks.append(f"CPCM({cpcm})")
-    if smd:
-        toks.append(f"SMD({smd})")
-    toks += extra_tokens
-    if force_tokens:
-        toks += force_tokens
-    return _join_bang_tokens(toks)
+try:
+    # Compiled fast path (see orca_mkinput_core.pyx; build with
+    # `python setup.py build_ext --inplace`). Optional: the pure-Python
+    # fallbacks below are identical in behavior.
+    from orca_mkinput_core import (
+        parse_extras as _parse_extras,
+        join_bang_tokens as _join_bang_tokens,
+        make_bang_line as _make_bang_line,
+    )
+except ImportError:
+    def _parse_extras(extra_list):
+        if not extra_list:
+            return []
+        toks = []
+        for item in extra_list:
+            for t in item.replace(",", " ").split():
+                t = t.strip()
+                if t:
+                    toks.append(t)
+        return toks
+
+    def _join_bang_tokens(tokens):
+        return "! " + " ".join([t for t in tokens if t])
+
+    def _make_bang_line(method, basis, job, grid_token, cpcm, smd, extra_tokens, force_tokens=None):
+        toks = []
+        if method:
+            toks.append(method)
+        if basis and basis not in ("None", "-", "NA"):
+            toks.append(basis)
+        if grid_token:
+            toks.append(grid_token)
+        # Default-tightSCF only if user didn’t explicitly add tightSCF/LooseSCF in extras
+        if not _has_scf_marker(extra_tokens):
+            toks.append("TightSCF")
+        toks += JOB_MAP.get(job, [])
+        if cpcm:
+            toks.append(f"CPCM({cpcm})")
+        if smd:
+            toks.append(f"SMD({smd})")
+        toks += extra_tokens
+        if force_tokens:
+            toks += force_tokens
+        return _join_bang_tokens(toks)
 
 def _pal_block(pal):  # %pal style
     return f"%pal\n  nprocs {pal}\nend"
@@ -101,7 +120,19 @@ def _tddft_block(nroots):
 def _file_exists(p):
     return p and Path(p).exists()
 
-def _read_text_file(path):
+_MKDIR_CACHE = set()
+
+def _ensure_dir(d):
+    """makedirs at most once per directory per process (batches reuse one outdir)."""
+    d = os.fspath(d)
+    if d and d not in _MKDIR_CACHE:
+        os.makedirs(d, exist_ok=True)
+        _MKDIR_CACHE.add(d)
+
+@functools.lru_cache(maxsize=128)
+def _read_text_file(path: str) -> str:
+    # Cached: the same --extra-block file is typically injected into every
+    # input of a batch. Argument must stay a hashable str (not Path).
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"extra block file not found: {path}")
@@ -127,12 +158,24 @@ def _collect_step_extra_blocks(args):
 
 # ----------------------------- Writers ---------------------------------------
 
-def write_single_step(outpath, xyzfile, charge, mult, method, basis, job, grid, cpcm, smd,
-                      extra, pal, maxcore_mb, nstates, moinp,
-                      pal_style="block", extra_blocks=None):
-    """
-    Normal (non-%compound) input.
-    """
+# In --folder batches the whole input is identical except for the coordinate
+# filename, so the writers build one bytes template with this placeholder and
+# substitute per file.
+_XYZ_TOKEN = b"{XYZFILE}"
+
+def _write_bytes(outpath, data):
+    _ensure_dir(os.path.dirname(os.fspath(outpath)))
+    fd = os.open(os.fspath(outpath), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def build_single_step_template(charge, mult, method, basis, job, grid, cpcm, smd,
+                               extra, pal, maxcore_mb, nstates, moinp,
+                               pal_style="block", extra_blocks=None):
+    """Normal (non-%compound) input as bytes, with _XYZ_TOKEN for the xyz name."""
     extra_tokens = _parse_extras(extra)
     if moinp and not any(t.lower() == "moread" for t in extra_tokens):
         extra_tokens.append("moread")
@@ -155,22 +198,35 @@ def write_single_step(outpath, xyzfile, charge, mult, method, basis, job, grid,
     if blocks:
         content.append("\n".join(blocks))
     if moinp:
-        content.append(f'%moinp "{moinp}"')   # must precede the * xyzfile   
+        content.append(f'%moinp "{moinp}"')   # must precede the * xyzfile
     if extra_blocks:
         content.append("\n".join(extra_blocks))
-        
-    content.append(f"\n* xyzfile {charge} {mult} {xyzfile}\n\n")
 
-    Path(outpath).parent.mkdir(parents=True, exist_ok=True)
-    with open(outpath, "w") as f:
-        f.write("\n\n".join(content))
+    content.append(f"\n* xyzfile {charge} {mult} {{XYZFILE}}\n\n")
+
+    return "\n\n".join(content).encode()
+
+
+def write_single_step(outpath, xyzfile, charge, mult, method, basis, job, grid, cpcm, smd,
+                      extra, pal, maxcore_mb, nstates, moinp,
+                      pal_style="block", extra_blocks=None):
+    """
+    Normal (non-%compound) input.
+    """
+    template = build_single_step_template(
+        charge, mult, method, basis, job, grid, cpcm, smd,
+        extra, pal, maxcore_mb, nstates, moinp,
+        pal_style=pal_style, extra_blocks=extra_blocks,
+    )
+    _write_bytes(outpath, template.replace(_XYZ_TOKEN, os.fsencode(xyzfile)))
     print(f"[OK] Wrote {outpath}")
 
 
-def write_compound(outpath, xyzfile, charge, mult, steps, pal, maxcore_mb,
-                   pal_style="bang", global_extra_blocks=None, step_extra_blocks=None):
+def build_compound_template(steps, pal, maxcore_mb, pal_style="bang",
+                            global_extra_blocks=None, step_extra_blocks=None,
+                            charge=0, mult=1):
     """
-    %compound with one or more steps.
+    %compound input as bytes, with _XYZ_TOKEN for the xyz name.
     Each step: dict with keys {method,basis,job,grid,cpcm,smd,extra_tokens,moinp}.
     The first step references coordinates; subsequent steps just declare the job.
     """
@@ -186,39 +242,46 @@ def write_compound(outpath, xyzfile, charge, mult, steps, pal, maxcore_mb,
     if global_extra_blocks:
         header_global = "\n".join(global_extra_blocks)
 
-    comp = []
-    comp.append("%compound")
+    step_parts = ["%compound\n"]
     for i, st in enumerate(steps, start=1):
-        comp.append("New_step")
-        extra_tokens = st["extra_tokens"].copy()
+        extra_tokens = st["extra_tokens"]
         if st.get("moinp") and not any(tok.lower() == "moread" for tok in extra_tokens):
-            extra_tokens.append("moread")
-            bang = _make_bang_line(st["method"], st["basis"], st["job"], st["grid"], st["cpcm"], st["smd"], extra_tokens)
-        else:
-            bang = _make_bang_line(st["method"], st["basis"], st["job"], st["grid"], st["cpcm"], st["smd"], st["extra_tokens"])
-        comp.append(bang)
-        if st.get("moinp"):
-            comp.append(f'%moinp "{st["moinp"]}"')
-        if st.get("job") == "tddft":
-            comp.append(_tddft_block(st["nstates"]))
-        comp.append(_scf_block())
-        # Inject step-specific blocks (if any)
+            # New list only when moread must be appended; shared reference otherwise.
+            extra_tokens = extra_tokens + ["moread"]
+        bang = _make_bang_line(st["method"], st["basis"], st["job"], st["grid"], st["cpcm"], st["smd"], extra_tokens)
+        moinp = f'%moinp "{st["moinp"]}"\n' if st.get("moinp") else ""
+        tddft = f"{_tddft_block(st['nstates'])}\n" if st.get("job") == "tddft" else ""
+        # Step-specific injected blocks (if any)
+        extra = ""
         if step_extra_blocks and i in step_extra_blocks:
-            comp.append("\n".join(step_extra_blocks[i]).rstrip())
+            extra = "\n".join(step_extra_blocks[i]).rstrip() + "\n"
         # First step carries coordinates:
-        if i == 1:
-            comp.append(f"* xyzfile {charge} {mult} {xyzfile}\n")
-        comp.append("Step_end\n")
-    comp.append("EndRun")
-    body = "\n".join(comp)
-
-    Path(outpath).parent.mkdir(parents=True, exist_ok=True)
-    with open(outpath, "w") as f:
-        if header:
-            f.write(header + "\n\n")
-        if global_extra_blocks:
-            f.write("\n".join(global_extra_blocks).rstrip() + "\n\n")
-        f.write(body + "\n")
+        coords = f"* xyzfile {charge} {mult} {{XYZFILE}}\n\n" if i == 1 else ""
+        step_parts.append(f"New_step\n{bang}\n{moinp}{tddft}{_scf_block()}\n{extra}{coords}Step_end\n\n")
+    step_parts.append("EndRun")
+
+    # One flat list, one terminal join — no quadratic += or nested joins.
+    parts = []
+    if header:
+        parts.append(header)
+        parts.append("\n\n")
+    if global_extra_blocks:
+        parts.append("\n".join(global_extra_blocks).rstrip())
+        parts.append("\n\n")
+    parts.extend(step_parts)
+    parts.append("\n")
+    return "".join(parts).encode()
+
+
+def write_compound(outpath, xyzfile, charge, mult, steps, pal, maxcore_mb,
+                   pal_style="bang", global_extra_blocks=None, step_extra_blocks=None):
+    """%compound with one or more steps (see build_compound_template)."""
+    template = build_compound_template(
+        steps, pal, maxcore_mb, pal_style=pal_style,
+        global_extra_blocks=global_extra_blocks, step_extra_blocks=step_extra_blocks,
+        charge=charge, mult=mult,
+    )
+    _write_bytes(outpath, template.replace(_XYZ_TOKEN, os.fsencode(xyzfile)))
     print(f"[OK] Wrote %compound input: {outpath}")
 
 
@@ -251,33 +314,154 @@ def write_neb_input(outdir, name, mode, method, basis, grid, cpcm, smd, extra,
     blocks.append(_maxcore_block(maxcore_mb))
     blocks.append(_scf_block())
 
-    neb_lines = ["%NEB", f'  NEB_END_XYZFILE "{product_xyz}"']
-    if ts_xyz:
-        neb_lines.append(f'  NEB_TS_XYZFILE "{ts_xyz}"')
-    neb_lines.append(f"  SpringConst {springconst}")
-    neb_lines.append(f"  MAXITER {maxiter}")
-    neb_lines.append(f"  NImages {nimages}")
-    neb_lines.append("end")
+    ts_line = f'  NEB_TS_XYZFILE "{ts_xyz}"\n' if ts_xyz else ""
+    neb_block = (
+        f'%NEB\n  NEB_END_XYZFILE "{product_xyz}"\n{ts_line}'
+        f"  SpringConst {springconst}\n  MAXITER {maxiter}\n  NImages {nimages}\nend"
+    )
 
     chunks = [
         header,
         "\n".join(blocks),
-        "\n".join(neb_lines),
+        neb_block,
         f"* xyzfile {charge} {mult} {reactant_xyz}\n",
     ]
 
+    # Flat parts list, one terminal join, one write.
+    parts = []
+    for c in chunks:
+        if c:
+            if parts:
+                parts.append("\n\n")
+            parts.append(c)
+    parts.append("\n")
+
     outdir = Path(outdir) if outdir else Path.cwd()
-    outdir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(outdir)
     outpath = outdir / f"{name}.inp"
-    with open(outpath, "w") as f:
-        f.write("\n\n".join([c for c in chunks if c]) + "\n")
+    _write_bytes(outpath, "".join(parts).encode())
     print(f"[OK] Wrote minimal {mode.upper()} input: {outpath}")
 
 
+# Per-batch config frozen once in main() and shared by every worker: the file
+# body is prebuilt as a bytes template, only the xyz name varies per file.
+# out_base is the resolved --outdir as a plain str (None = next to the xyz).
+_BatchConfig = namedtuple("_BatchConfig", "args compound_mode template out_base")
+
+def _emit_one(xyz_path, cfg):
+    """Generate one .inp for a --folder batch (module-level so it pickles for the pool).
+
+    Works on plain str paths — Path arithmetic per file is measurable on
+    folders with thousands of entries.
+    """
+    args = cfg.args
+    xyz_dir, xyz_name = os.path.split(xyz_path)
+    stem = xyz_name[:-4] if xyz_name.endswith(".xyz") else os.path.splitext(xyz_name)[0]
+    d = cfg.out_base if cfg.out_base is not None else xyz_dir
+    outpath = f"{d}{os.sep}{stem}.inp" if d else f"{stem}.inp"
+
+    if os.path.exists(outpath) and not args.overwrite:
+        print(f"[SKIP] {outpath} exists. Use --overwrite to replace.", file=sys.stderr)
+        return
+
+    _write_bytes(outpath, cfg.template.replace(_XYZ_TOKEN, os.fsencode(xyz_name)))
+    if cfg.compound_mode:
+        print(f"[OK] Wrote %compound input: {outpath}")
+    else:
+        print(f"[OK] Wrote {outpath}")
+
 
 # ----------------------------- CLI / Main ------------------------------------
 
+# Flag tables for the argparse-free fast path. Single-step invocations in a
+# tight shell loop (for f in *.xyz; do orca_mkinput.py ...; done) are dominated
+# by building argparse's ~40-option tree; the hand parser below skips that.
+# Anything it does not recognize (numbered/compound flags, --folder, --help,
+# --opt=value forms) falls back to the full argparse parser.
+_FAST_STR = {
+    "--xyz": "xyz", "--outdir": "outdir", "--name": "name",
+    "--method": "method", "--basis": "basis", "--job": "job",
+    "--cpcm": "cpcm", "--smd": "smd", "--grid": "grid", "--moinp": "moinp",
+    "--pal-style": "pal_style",
+    "--neb-mode": "neb_mode", "--neb-product": "neb_product", "--neb-ts": "neb_ts",
+}
+_FAST_INT = {
+    "--charge": "charge", "--mult": "mult", "--nstates": "nstates",
+    "--pal": "pal", "--maxcore-mb": "maxcore_mb",
+    "--neb-maxiter": "neb_maxiter", "--nimages": "nimages",
+}
+_FAST_FLOAT = {"--neb-springconst": "neb_springconst"}
+_FAST_APPEND = {"--extra": "extra", "--extra-block": "extra_block"}
+_FAST_FLAGS = {"--overwrite": "overwrite"}
+
+def _default_namespace():
+    """Defaults matching parse_args() exactly, including the numbered step slots."""
+    d = dict(xyz=None, folder=None, outdir=None, pattern="*.xyz", name=None,
+             charge=0, mult=1, method=None, basis=None, job=None, nstates=10,
+             cpcm=None, smd=None, grid="DEFGRID3", moinp=None, extra=None,
+             extra_block=None, overwrite=False, pal=32, maxcore_mb=4000,
+             pal_style="block", neb_mode=None, neb_product=None, neb_ts=None,
+             neb_springconst=0.01, neb_maxiter=200, nimages=10)
+    for k in range(1, 5):
+        for field in ("job", "method", "basis", "grid", "cpcm", "smd", "moinp"):
+            d[f"{field}{k}"] = None
+        d[f"nstates{k}"] = 10
+        d[f"extra{k}"] = None
+        d[f"extra_block{k}"] = None
+    return d
+
+def _fast_parse(argv):
+    """Hand-parse the common single-step flag set. Returns a namespace, or None
+    to defer to argparse (unknown flag, bad value, compound/folder/help)."""
+    from types import SimpleNamespace
+    ns = SimpleNamespace(**_default_namespace())
+    i = 0
+    n = len(argv)
+    while i < n:
+        a = argv[i]
+        if a in _FAST_FLAGS:
+            setattr(ns, _FAST_FLAGS[a], True)
+            i += 1
+            continue
+        if i + 1 >= n:
+            return None
+        val = argv[i + 1]
+        if a in _FAST_STR:
+            setattr(ns, _FAST_STR[a], val)
+        elif a in _FAST_INT:
+            try:
+                setattr(ns, _FAST_INT[a], int(val))
+            except ValueError:
+                return None
+        elif a in _FAST_FLOAT:
+            try:
+                setattr(ns, _FAST_FLOAT[a], float(val))
+            except ValueError:
+                return None
+        elif a in _FAST_APPEND:
+            dest = _FAST_APPEND[a]
+            lst = getattr(ns, dest) or []
+            lst.append(val)
+            setattr(ns, dest, lst)
+        else:
+            return None
+        i += 2
+    # Let argparse produce the proper error message for bad choices:
+    if ns.job is not None and ns.job not in JOB_MAP:
+        return None
+    if ns.pal_style not in ("block", "bang"):
+        return None
+    if ns.neb_mode is not None and ns.neb_mode not in ("neb", "neb-ci", "neb-ts"):
+        return None
+    return ns
+
 def parse_args():
+    args = _fast_parse(sys.argv[1:])
+    if args is not None:
+        return args
+
+    import argparse  # deferred: only the compound/folder/help path pays for it
+
     p = argparse.ArgumentParser(description="Generate ORCA .inp (single, %%compound, NEB). For compound scripts add an index to the flag (e.g. --job1 XX, --method1 XX)")
 
     src = p.add_mutually_exclusive_group(required=False)
@@ -334,36 +518,41 @@ def parse_args():
 
     return p.parse_args()
 
+# Attribute names probed per compound step, built once instead of
+# re-formatting f"{field}{k}" inside a double getattr loop.
+_STEP_FIELDS = ("job", "method", "basis", "grid", "cpcm", "smd", "extra", "moinp")
+_NUMBERED_NAMES = tuple(
+    tuple(f"{field}{k}" for field in _STEP_FIELDS) for k in range(1, 5)
+)
+
 def _collect_compound_steps(args):
+    d = vars(args)
     steps = []
-    for k in range(1, 5):
-        if any(getattr(args, f"{field}{k}") is not None for field in ["job","method","basis","grid","cpcm","smd","extra","moinp"]):
+    for k, names in enumerate(_NUMBERED_NAMES, start=1):
+        if any(d.get(name) is not None for name in names):
             st = {
-                "job": getattr(args, f"job{k}", None) or "sp",
-                "method": getattr(args, f"method{k}", None) or args.method or "wB97X-D4",
-                "basis": getattr(args, f"basis{k}", None) or args.basis or "def2-SVPD",
-                "grid": getattr(args, f"grid{k}", None) or args.grid,
-                "cpcm": getattr(args, f"cpcm{k}", None),
-                "smd": getattr(args, f"smd{k}", None),
-                "extra_tokens": _parse_extras(getattr(args, f"extra{k}", None)),
-                "moinp": getattr(args, f"moinp{k}", None),
-                "nstates": getattr(args, f"nstates{k}", None),
+                "job": d.get(f"job{k}") or "sp",
+                "method": d.get(f"method{k}") or args.method or "wB97X-D4",
+                "basis": d.get(f"basis{k}") or args.basis or "def2-SVPD",
+                "grid": d.get(f"grid{k}") or args.grid,
+                "cpcm": d.get(f"cpcm{k}"),
+                "smd": d.get(f"smd{k}"),
+                "extra_tokens": _parse_extras(d.get(f"extra{k}")),
+                "moinp": d.get(f"moinp{k}"),
+                "nstates": d.get(f"nstates{k}"),
             }
             steps.append(st)
     return steps
 
 def _any_numbered_options_present(args):
-    for k in range(1, 5):
-        for field in ["job","method","basis","grid","cpcm","smd","extra","moinp"]:
-            if getattr(args, f"{field}{k}", None) is not None:
-                return True
-    return False
+    d = vars(args)
+    return any(d.get(name) is not None for names in _NUMBERED_NAMES for name in names)
 
 def _resolve_name_outdir(xyzpath, args):
     xyz = Path(xyzpath) if xyzpath else None
     stem = args.name or (xyz.stem if xyz else "orca_job")
     outdir = Path(args.outdir) if args.outdir else (xyz.parent if xyz else Path.cwd())
-    outdir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(outdir)
     return stem, outdir
 
 def _load_neb_list(path):
@@ -419,7 +608,15 @@ def main():
         return 1
 
     if args.folder:
-        files = sorted(Path(args.folder).glob(args.pattern))
+        if args.pattern == "*.xyz":
+            # Default pattern: one getdents pass, no fnmatch/Path-per-entry churn.
+            with os.scandir(args.folder) as it:
+                files = sorted(
+                    e.path for e in it
+                    if e.is_file() and e.name.endswith(".xyz")
+                )
+        else:
+            files = sorted(str(p) for p in Path(args.folder).glob(args.pattern))
         if not files:
             print(f"[WARN] No files matched {args.pattern} in {args.folder}", file=sys.stderr)
             return 0
@@ -430,41 +627,32 @@ def main():
         step_blocks   = _collect_step_extra_blocks(args) if compound_mode else None
         steps         = _collect_compound_steps(args) if compound_mode else None
 
-        rc = 0
-        for xyz in files:
-            stem = args.name or xyz.stem
-            outdir = Path(args.outdir) if args.outdir else xyz.parent
-            outpath = outdir / f"{stem}.inp"
-
-            if outpath.exists() and not args.overwrite:
-                print(f"[SKIP] {outpath} exists. Use --overwrite to replace.", file=sys.stderr)
-                continue
-
-            if compound_mode:
-                write_compound(
-                    outpath=outpath,
-                    xyzfile=xyz.name,
-                    charge=args.charge, mult=args.mult,
-                    steps=steps,
-                    pal=args.pal, maxcore_mb=args.maxcore_mb,
-                    pal_style=args.pal_style,
-                    global_extra_blocks=global_blocks,
-                    step_extra_blocks=step_blocks,
-                )
-            else:
-                write_single_step(
-                    outpath=outpath,
-                    xyzfile=xyz.name,
-                    charge=args.charge, mult=args.mult,
-                    method=(args.method or "wB97X-D4"),
-                    basis=(args.basis or "def2-TZVPPD"),
-                    job=(args.job or "sp"),
-                    grid=args.grid, cpcm=args.cpcm, smd=args.smd, extra=args.extra,
-                    pal=args.pal, maxcore_mb=args.maxcore_mb, nstates=args.nstates,
-                    moinp=args.moinp, pal_style=args.pal_style,
-                    extra_blocks=global_blocks,
-                )
-        return rc
+        # Build the shared file body once; workers only substitute the xyz name.
+        if compound_mode:
+            template = build_compound_template(
+                steps, args.pal, args.maxcore_mb, pal_style=args.pal_style,
+                global_extra_blocks=global_blocks, step_extra_blocks=step_blocks,
+                charge=args.charge, mult=args.mult,
+            )
+        else:
+            template = build_single_step_template(
+                args.charge, args.mult,
+                (args.method or "wB97X-D4"), (args.basis or "def2-TZVPPD"),
+                (args.job or "sp"), args.grid, args.cpcm, args.smd, args.extra,
+                args.pal, args.maxcore_mb, args.nstates, args.moinp,
+                pal_style=args.pal_style, extra_blocks=global_blocks,
+            )
+
+        # Each file is independent: fan the batch out over all cores.
+        out_base = os.fspath(Path(args.outdir)) if args.outdir else None
+        if out_base is not None:
+            _ensure_dir(out_base)
+        cfg = _BatchConfig(args, compound_mode, template, out_base)
+        ncpu = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=ncpu) as ex:
+            list(ex.map(functools.partial(_emit_one, cfg=cfg), files,
+                        chunksize=max(1, len(files) // (4 * ncpu))))
+        return 0
 
 
     # Single file modes (%compound or single-step)
@@ -0,0 +1,77 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+orca_mkinput_core.pyx - compiled fast path for orca_mkinput.py input assembly.
+
+Holds the token-level helpers that dominate large --folder batches
+(parse_extras, join_bang_tokens, make_bang_line). Build in place with:
+
+    python setup.py build_ext --inplace
+
+orca_mkinput.py falls back to identical pure-Python implementations when
+this extension has not been built, so the scripts still work when simply
+copied to ~/bin.
+"""
+
+JOB_MAP = {
+    "sp": [],
+    "opt": ["Opt"],
+    "freq": ["Freq"],
+    "optfreq": ["Opt", "Freq"],
+    "optts": ["OptTS"],
+    "tddft": [],
+    "neb": ["NEB"],
+    "nebci": ["NEB-CI"],
+    "nebts": ["NEB-TS"],
+}
+
+_SCF_MARKERS = ("tightscf", "loosescf")
+
+
+cpdef list parse_extras(extra_list):
+    cdef list toks = []
+    cdef str item, t
+    if not extra_list:
+        return toks
+    for item in extra_list:
+        for t in item.replace(",", " ").split():
+            t = t.strip()
+            if t:
+                toks.append(t)
+    return toks
+
+
+cpdef str join_bang_tokens(list tokens):
+    cdef str t
+    return "! " + " ".join([t for t in tokens if t])
+
+
+cpdef str make_bang_line(str method, str basis, str job, str grid_token,
+                         str cpcm, str smd, list extra_tokens,
+                         list force_tokens=None):
+    cdef list toks = []
+    cdef Py_ssize_t i
+    cdef str t
+    cdef bint has_scf = False
+    if method:
+        toks.append(method)
+    if basis and basis not in ("None", "-", "NA"):
+        toks.append(basis)
+    if grid_token:
+        toks.append(grid_token)
+    # Default-tightSCF only if user didn't explicitly add tightSCF/LooseSCF in extras
+    for i in range(len(extra_tokens)):
+        t = <str> extra_tokens[i]
+        if t.lower().startswith(_SCF_MARKERS):
+            has_scf = True
+            break
+    if not has_scf:
+        toks.append("TightSCF")
+    toks += JOB_MAP.get(job, [])
+    if cpcm:
+        toks.append(f"CPCM({cpcm})")
+    if smd:
+        toks.append(f"SMD({smd})")
+    toks += extra_tokens
+    if force_tokens:
+        toks += force_tokens
+    return join_bang_tokens(toks)
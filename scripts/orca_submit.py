@@ -1,12 +1,33 @@
 #!/usr/bin/env python3
 
 import argparse
+import mmap
 import os
 import re
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
-TEMPLATE = """#!/bin/bash
+# Lines are lowercased before matching, so no IGNORECASE needed.
+_PAL_RE = re.compile(r'pal\s*(\d+)')
+
+# Bytes patterns for the mmap fast path in extract_resources: the one-line
+# %pal form, the "! ... PALn" keyword form, and %maxcore.
+_PAL_ONELINE_B = re.compile(rb'(?im)^[ \t]*%pal\b[^\n]*?nprocs[ \t]+(\d+)')
+_BANG_PAL_B = re.compile(rb'(?im)^[ \t]*![^\n]*?pal[ \t]*(\d+)')
+_MAXCORE_B = re.compile(rb'(?im)^[ \t]*%maxcore[ \t]+(\d+)')
+
+# The environment doesn't change mid-run; read it once instead of per file.
+_DEFAULT_USER = os.environ.get('USER', 'user')
+
+def _render_slurm(job_name, ntasks, time, partition, nodelist, exclusive,
+                  memory, input_name, workdir_block, staging_block,
+                  cleanup_block, cd_block, copyback_block, numa_setup,
+                  rsync_flags):
+    """Render the job script. An f-string compiles its placeholders once at
+    import, unlike str.format which re-parses the whole template per call."""
+    return f"""#!/bin/bash
 #SBATCH --job-name={job_name}
 #SBATCH --nodes=1
 #SBATCH --ntasks-per-node={ntasks}
@@ -38,6 +59,8 @@ export OMPI_MCA_plm_rsh_agent=ssh
 # I/O config
 ############################
 INPUT="{input_name}"
+# Compression only pays on slow links; local/LAN copies stay uncompressed.
+RSYNC_FLAGS="{rsync_flags}"
 
 {workdir_block}
 
@@ -66,8 +89,13 @@ scontrol show hostnames "$SLURM_JOB_NODELIST" > "$WORKDIR/$(basename $INPUT .inp
 ############################
 {cd_block}
 
+# Staging may still be running in the background; it must finish before ORCA
+# touches any restart file.
+if [[ -n "${{STAGE_PID:-}}" ]]; then wait "$STAGE_PID"; rm -f "${{STAGE_LIST:-}}"; fi
+
+{numa_setup}
 echo "[INFO] launching ORCA on $(hostname) at $(date)"
-"$ORCA_PATH/orca" "$INPUT" > "${{INPUT%.inp}}.out"
+$NUMA_CMD "$ORCA_PATH/orca" "$INPUT" > "${{INPUT%.inp}}.out"
 
 ############################
 # Copy results back
@@ -77,128 +105,229 @@ echo "[INFO] launching ORCA on $(hostname) at $(date)"
 echo "[INFO] done at $(date)"
 """
 
-def extract_resources(inp_file):
-    with open(inp_file, 'r') as f:
-        lines = f.readlines()
 
+def extract_resources(inp_file):
     # Defaults
     nprocs = 32
     maxcore = 4000
 
+    # Fast path: mmap the file and let two compiled bytes regexes find the
+    # directives without decoding or iterating lines in Python. Short-circuit
+    # only when both hit; the multi-line %pal block form (and anything else
+    # unusual) drops through to the line parser below.
+    try:
+        with open(inp_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            m_pal = _PAL_ONELINE_B.search(mm) or _BANG_PAL_B.search(mm)
+            m_core = _MAXCORE_B.search(mm)
+            if m_pal and m_core:
+                return int(m_pal.group(1)), int(m_core.group(1))
+    except (OSError, ValueError):
+        pass  # empty files can't be mmapped; the line loop handles them
+
+    found_nprocs = False
+    found_maxcore = False
     inside_pal = False
-    for line in lines:
-        l = line.strip().lower()
-        if l.startswith('%pal'):
-            inside_pal = True
-            continue
-        if inside_pal:
-            if l.startswith('end'):
-                inside_pal = False
-            elif 'nprocs' in l:
+    # Stream line by line instead of readlines(): resource blocks sit near the
+    # top of ORCA inputs, while the bulk of the file is coordinates.
+    with open(inp_file, 'r') as f:
+        for line in f:
+            l = line.strip().lower()
+            if l.startswith('%pal'):
+                inside_pal = True
+                continue
+            if inside_pal:
+                if l.startswith('end'):
+                    inside_pal = False
+                elif 'nprocs' in l:
+                    try:
+                        nprocs = int(l.split()[1])
+                        found_nprocs = True
+                    except (IndexError, ValueError):
+                        pass
+            if l.startswith('%maxcore'):
                 try:
-                    nprocs = int(l.split()[1])
+                    maxcore = int(l.split()[1])
+                    found_maxcore = True
                 except (IndexError, ValueError):
                     pass
-        if l.startswith('%maxcore'):
-            try:
-                maxcore = int(l.split()[1])
-            except (IndexError, ValueError):
-                pass
-        if l.startswith('!') and 'pal' in l.lower():
-            m = re.search(r'pal\s*(\d+)', l, re.IGNORECASE)
-            if m:
-                nprocs = int(m.group(1))
+            if l.startswith('!') and 'pal' in l:
+                m = _PAL_RE.search(l)
+                if m:
+                    nprocs = int(m.group(1))
+                    found_nprocs = True
+            if found_nprocs and found_maxcore and not inside_pal:
+                break
 
     return nprocs, maxcore
 
-def create_slurm(inp_path, args):
-    inp_path = Path(inp_path)
-    if not inp_path.exists():
-        print(f"[ERROR] File not found: {inp_path}")
-        return
-
-    nprocs, maxcore = extract_resources(inp_path)
-    mem = nprocs * maxcore
-    job_name = args.job_name or f"{os.getenv('USER', 'user')}_ORCA_calc"
-    slurm_path = inp_path.with_suffix(".slurm")
-
-    # Workdir-dependent blocks
-    if args.workdir == "lscratch":
-        workdir_block = """# Preferred fast local scratch; fall back to /tmp if needed
-if [[ -d /lscratch ]]; then
-  WORKDIR="/lscratch/${SLURM_JOB_ID}"
-else
-  echo "[WARN] /lscratch not found on $(hostname); using /tmp"
-  WORKDIR="/tmp/${SLURM_JOB_ID}"
-fi
-"""
-        staging_block = """mkdir -p "$WORKDIR"
-
-shopt -s nullglob
-TO_COPY=( *.inp *.gbw *.xyz *.hess *.engrad *.molden.input *.molden *.wfn *.num *.mkl *.trj *.swag *.tmp )
+# Staging/cleanup/copy-back shell fragments shared by the lscratch and
+# scratch modes (the only difference there is where mkdir happens).
+_STAGING_BODY = """# One find pass over the directory instead of a shell glob per pattern
+# (nullglob expansion rescans the directory for every pattern).
+mapfile -t TO_COPY < <(find . -maxdepth 1 -type f \\( -name '*.inp' -o -name '*.gbw' -o -name '*.xyz' -o -name '*.hess' -o -name '*.engrad' -o -name '*.molden*' -o -name '*.wfn' -o -name '*.num' -o -name '*.mkl' -o -name '*.trj' -o -name '*.swag' -o -name '*.tmp' \\))
 TO_COPY+=( "$INPUT" )
 
 echo "[INFO] staging inputs to $WORKDIR"
+# One rsync for the whole set: a per-file rsync loop pays process startup
+# per file, which dominates for jobs with many auxiliary inputs.
+# Outside $WORKDIR so the copy-back and cleanup rsyncs never ship it.
+STAGE_LIST="$(mktemp)"
+# NUL-delimited so filenames with spaces or quotes survive xargs/tar.
 for f in "${TO_COPY[@]}"; do
-  [[ -e "$f" ]] && /usr/bin/rsync -a "$f" "$WORKDIR/"
+  [[ -e "$f" ]] && printf '%s\\0' "$f" >> "$STAGE_LIST"
 done
+# The input itself goes first, synchronously; the bulky restart/guess files
+# stream in the background so the transfer overlaps with the remaining job
+# setup. The wait before the ORCA launch guarantees staging has finished.
+/usr/bin/rsync $RSYNC_FLAGS "$INPUT" "$WORKDIR/"
+if [[ "${#TO_COPY[@]}" -gt 32 ]]; then
+  # Many small fragments (.molden/.wfn restarts): a single tar pipe turns N
+  # per-file metadata ops and fsyncs into one streaming read/write.
+  tar -cf - --null -T "$STAGE_LIST" | tar -xf - -C "$WORKDIR" &
+elif [[ "$(stat -c %d "$PWD")" == "$(stat -c %d "$WORKDIR")" ]]; then
+  # Same filesystem: reflink clones are O(1) metadata ops on XFS/Btrfs and
+  # degrade to a plain copy on ext4 (--reflink=auto).
+  xargs -0 -a "$STAGE_LIST" -r cp --reflink=auto -a -t "$WORKDIR/" &
+else
+  # -W/--inplace: destination is a fresh local workdir, so rsync's delta
+  # algorithm is pure CPU overhead; copy whole files and skip the temp-file
+  # rename. RSYNC_FLAGS only adds compression for --remote-stage wan.
+  /usr/bin/rsync $RSYNC_FLAGS --from0 --files-from="$STAGE_LIST" ./ "$WORKDIR/" &
+fi
+STAGE_PID=$!
 """
-        if args.clean == "standart":
-            cleanup_block = """set +e
+
+_CLEANUP_STANDART = """set +e
 if [[ -d "$WORKDIR" ]]; then
   echo "[INFO] cleaning up $WORKDIR"
   rm -rf "$WORKDIR"
 fi"""
-        elif args.clean == "copy_tmp":
-            cleanup_block = """set +e
+
+_CLEANUP_COPY_TMP = """set +e
 if [[ -d "$WORKDIR" ]]; then
   echo "[INFO] cleaning up $WORKDIR"
-  cp * "$RESULTDIR"
+  # Salvage outputs without re-copying giant scratch volumes (cp * also
+  # broke on directories and filenames with spaces).
+  rsync $RSYNC_FLAGS --exclude='*.tmp' --exclude='*.tmp.*' --exclude='/tmp_*' "$WORKDIR"/ "$RESULTDIR"/ 2>/dev/null || true
   rm -rf "$WORKDIR"
 fi"""
-        cd_block = 'cd "$WORKDIR"'
-        copyback_block = 'echo "[INFO] copying results to $RESULTDIR"\n/usr/bin/rsync -a "$WORKDIR"/ "$RESULTDIR"/'
+
+_COPYBACK = """echo "[INFO] copying results to $RESULTDIR"
+# Shard the copy-back across parallel rsyncs (one top-level entry per worker)
+# to overlap per-file metadata ops when $RESULTDIR sits on GPFS/Lustre.
+# Tune with STAGE_PARALLELISM; falls back to one rsync if xargs is missing.
+if command -v xargs >/dev/null; then
+  ls -1A "$WORKDIR" | xargs -P "${STAGE_PARALLELISM:-8}" -I{} /usr/bin/rsync $RSYNC_FLAGS "$WORKDIR/{}" "$RESULTDIR/"
+else
+  /usr/bin/rsync $RSYNC_FLAGS "$WORKDIR"/ "$RESULTDIR"/
+fi"""
+
+@lru_cache(maxsize=None)
+def _node_has_lscratch(partition, nodelist):
+    """Submit-time probe: do the target nodes advertise lscratch?
+
+    Checks the node feature tags via sinfo, once per (partition, nodelist)
+    pair. Returns True only on a positive match; missing sinfo, errors or an
+    absent tag all return None so the caller keeps the runtime fallback --
+    a cluster that simply doesn't tag the feature shouldn't lose it.
+    """
+    cmd = ["sinfo", "-h", "-o", "%f"]
+    if nodelist:
+        cmd += ["-n", nodelist]
+    if partition:
+        cmd += ["-p", partition]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    # sinfo prints one feature line per node group; on a heterogeneous
+    # partition a single tagged group must not vouch for the rest, or the
+    # baked path dies at mkdir on an untagged node. Require every group.
+    lines = [l for l in result.stdout.lower().splitlines() if l.strip()]
+    if lines and all("lscratch" in l for l in lines):
+        return True
+    return None
+
+
+def _resolve_blocks(args):
+    """Template blocks determined purely by --workdir/--clean.
+
+    create_all_slurms resolves them once for the whole batch instead of
+    re-branching and re-building the same strings per input file.
+    """
+    if args.workdir == "lscratch":
+        if _node_has_lscratch(args.partition, args.nodelist):
+            # Known-good at submit time: bake the path and drop the per-job
+            # stat and /tmp fallback branch from every generated script.
+            workdir_block = """# Fast local scratch (verified at submit time)
+WORKDIR="/lscratch/${SLURM_JOB_ID}"
+"""
+        else:
+            workdir_block = """# Preferred fast local scratch; fall back to /tmp if needed
+if [[ -d /lscratch ]]; then
+  WORKDIR="/lscratch/${SLURM_JOB_ID}"
+else
+  echo "[WARN] /lscratch not found on $(hostname); using /tmp"
+  WORKDIR="/tmp/${SLURM_JOB_ID}"
+fi
+"""
+        staging_block = 'mkdir -p "$WORKDIR"\n\n' + _STAGING_BODY
     elif args.workdir == "scratch":
         workdir_block = """# Use shared scratch
 WORKDIR="/scratch/${SLURM_JOB_ID}"
 mkdir -p "$WORKDIR"
 """
-        staging_block = """shopt -s nullglob
-TO_COPY=( *.inp *.gbw *.xyz *.hess *.engrad *.molden.input *.molden *.wfn *.num *.mkl *.trj *.swag *.tmp )
-TO_COPY+=( "$INPUT" )
-
-echo "[INFO] staging inputs to $WORKDIR"
-for f in "${TO_COPY[@]}"; do
-  [[ -e "$f" ]] && /usr/bin/rsync -a "$f" "$WORKDIR/"
-done
-"""
-        if args.clean == "standart":
-            cleanup_block = """set +e
-if [[ -d "$WORKDIR" ]]; then
-  echo "[INFO] cleaning up $WORKDIR"
-  rm -rf "$WORKDIR"
-fi"""
-        elif args.clean == "copy_tmp":
-            cleanup_block = """set +e
-if [[ -d "$WORKDIR" ]]; then
-  echo "[INFO] cleaning up $WORKDIR"
-  cp * "$RESULTDIR"
-  rm -rf "$WORKDIR"
-fi"""
-        cd_block = 'cd "$WORKDIR"'
-        copyback_block = 'echo "[INFO] copying results to $RESULTDIR"\n/usr/bin/rsync -a "$WORKDIR"/ "$RESULTDIR"/'
+        staging_block = _STAGING_BODY
     elif args.workdir == "pwd":
-        workdir_block = """# Use current directory (no staging)
+        return dict(
+            workdir_block="""# Use current directory (no staging)
 WORKDIR="$PWD"
-"""
-        staging_block = 'echo "[INFO] no staging; running in $PWD"'
-        cleanup_block = 'echo "[INFO] no cleanup for workdir=pwd"'
-        cd_block = 'cd "$WORKDIR"'
-        copyback_block = 'echo "[INFO] no copy-back; results already in $PWD"'
+""",
+            staging_block='echo "[INFO] no staging; running in $PWD"',
+            cleanup_block='echo "[INFO] no cleanup for workdir=pwd"',
+            cd_block='cd "$WORKDIR"',
+            copyback_block='echo "[INFO] no copy-back; results already in $PWD"',
+        )
     else:
         raise ValueError(f"Unknown workdir option: {args.workdir}")
 
-    slurm_content = TEMPLATE.format(
+    cleanup_block = _CLEANUP_STANDART if args.clean == "standart" else _CLEANUP_COPY_TMP
+    return dict(
+        workdir_block=workdir_block,
+        staging_block=staging_block,
+        cleanup_block=cleanup_block,
+        cd_block='cd "$WORKDIR"',
+        copyback_block=_COPYBACK,
+    )
+
+def create_slurm(inp_path, args, blocks=None):
+    inp_path = Path(inp_path)
+    if not inp_path.exists():
+        print(f"[ERROR] File not found: {inp_path}")
+        return
+
+    nprocs, maxcore = extract_resources(inp_path)
+    mem = nprocs * maxcore
+    job_name = args.job_name or f"{_DEFAULT_USER}_ORCA_calc"
+    slurm_path = inp_path.with_suffix(".slurm")
+
+    # Workdir-dependent blocks (precomputed by create_all_slurms for batches)
+    if blocks is None:
+        blocks = _resolve_blocks(args)
+
+    # ORCA's integral/DFT kernels are memory-bandwidth bound; without a NUMA
+    # policy the scheduler migrates ranks across sockets and bandwidth tanks.
+    if args.numa == "off":
+        numa_setup = 'NUMA_CMD=""'
+    else:
+        policy = "--interleave=all" if args.numa == "interleave" else "--localalloc"
+        numa_setup = (f'NUMA_CMD="numactl {policy}"\n'
+                      'command -v numactl >/dev/null || NUMA_CMD=""')
+
+    slurm_content = _render_slurm(
         job_name=job_name,
         ntasks=nprocs,
         memory=f"{mem}MB",
@@ -207,35 +336,97 @@ WORKDIR="$PWD"
         time=args.time,
         nodelist=f"#SBATCH --nodelist={args.nodelist}\n" if args.nodelist else "",
         input_name=inp_path.name,
-        workdir_block=workdir_block,
-        staging_block=staging_block,
-        cleanup_block=cleanup_block,
-        cd_block=cd_block,
-        copyback_block=copyback_block,
+        numa_setup=numa_setup,
+        rsync_flags=("-aW --inplace -z --compress-choice=zstd --compress-level=1"
+                     if args.remote_stage == "wan" else "-aW --inplace"),
+        **blocks,
     )
 
-    slurm_path.write_text(slurm_content)
+    # Bytes-mode write on a raw fd: skips the text-layer encoder per file,
+    # which adds up for bulk generation on a busy parallel filesystem.
+    fd = os.open(str(slurm_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, slurm_content.encode())
+    finally:
+        os.close(fd)
     print(f"[INFO] Created {slurm_path}")
     if args.submit:
         subprocess.run(["sbatch", str(slurm_path)])
         print(f"[INFO] Submitted {slurm_path}")
 
 def create_all_slurms(args):
-    for inp in Path(".").glob("*.inp"):
-        create_slurm(inp, args)
+    # scandir + endswith: no fnmatch and no Path object per entry.
+    with os.scandir(".") as it:
+        inps = sorted(e.name for e in it if e.is_file() and e.name.endswith(".inp"))
+    if not inps:
+        return
+    # Each .inp is parsed and rendered independently; spread the batch over
+    # all cores (argparse.Namespace pickles fine).
+    blocks = _resolve_blocks(args)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        list(ex.map(partial(create_slurm, args=args, blocks=blocks), inps))
+
+def _sbatch_header(path):
+    """Return the #SBATCH preamble of a script (used to group array-compatible jobs)."""
+    lines = []
+    with open(path) as f:
+        for line in f:
+            if line.startswith("#SBATCH"):
+                lines.append(line)
+            elif lines and line.strip() and not line.startswith("#"):
+                break
+    return "".join(lines)
+
+
+def _submit_many(scripts):
+    """Submit a set of .slurm scripts.
+
+    Scripts sharing an identical #SBATCH header are folded into a single
+    sbatch --array submission (one fork and one controller RPC instead of N);
+    anything else is submitted individually.
+    """
+    groups = {}
+    for s in scripts:
+        groups.setdefault(_sbatch_header(s), []).append(s)
+    singles = []
+    for header, members in groups.items():
+        if len(members) < 2 or not header:
+            singles.extend(members)
+            continue
+        cases = "\n".join(f'  {i}) exec bash "{s}" ;;' for i, s in enumerate(members))
+        wrapper = Path("submit_array.sh")
+        wrapper.write_text(
+            f'#!/bin/bash\n{header}case "$SLURM_ARRAY_TASK_ID" in\n{cases}\nesac\n'
+        )
+        print(f"[INFO] Submitting {len(members)} jobs as one array via {wrapper}")
+        subprocess.run(["sbatch", f"--array=0-{len(members) - 1}", str(wrapper)])
+    if singles:
+        # Launch the remaining sbatch calls concurrently instead of waiting on
+        # each fork in turn.
+        procs = [subprocess.Popen(["sbatch", s]) for s in singles]
+        for p in procs:
+            p.wait()
+
 
 def interactive_menu():
-    slurms = sorted(Path(".").glob("*.slurm"))
+    with os.scandir(".") as it:
+        slurms = sorted(e.name for e in it if e.is_file() and e.name.endswith(".slurm"))
     if not slurms:
         print("No .slurm files found.")
         return
     print("\nSelect SLURM scripts to submit:")
     for i, f in enumerate(slurms):
-        print(f"[{i}] {f.name}")
+        print(f"[{i}] {f}")
     try:
         idxs = input("Enter comma-separated indices (e.g. 0,2,3): ")
-        for i in map(int, idxs.split(",")):
-            subprocess.run(["sbatch", str(slurms[i])])
+        # Validate the whole selection up front so a typo at the end doesn't
+        # leave half the jobs already submitted.
+        indices = [int(tok) for tok in idxs.split(",")]
+        bad = [i for i in indices if not 0 <= i < len(slurms)]
+        if bad:
+            print(f"[ERROR] index out of range: {', '.join(map(str, bad))}")
+            return
+        _submit_many([slurms[i] for i in indices])
     except Exception as e:
         print(f"[ERROR] {e}")
 
@@ -265,6 +456,20 @@ def main():
         help='Where to run: "lscratch" (default), "scratch", or "pwd" (run-in-place; no staging/cleanup)'
     )
 
+    parser.add_argument(
+        "--remote-stage",
+        choices=["none", "lan", "wan"],
+        default="none",
+        help='Staging link type. "wan" adds light zstd compression to the rsync transfers; "none"/"lan" keep them uncompressed (compression is pure CPU cost on a fast link).'
+    )
+
+    parser.add_argument(
+        "--numa",
+        choices=["interleave", "local", "off"],
+        default="interleave",
+        help='NUMA policy for the ORCA launch: "interleave" (default) spreads allocations over all nodes, "local" allocates on the faulting node, "off" launches bare. Ignored if numactl is absent.'
+    )
+
     parser.add_argument(
         "--clean",
         choices=["standart", "copy_tmp"],
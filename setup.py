@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Optional build for the compiled orca_mkinput fast path.
+
+    python setup.py build_ext --inplace
+
+The scripts run fine without it (pure-Python fallbacks are built in).
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="oscer-scripts-core",
+    ext_modules=cythonize(
+        "scripts/orca_mkinput_core.pyx",
+        language_level=3,
+        compiler_directives={"boundscheck": False, "wraparound": False},
+    ),
+)